@@ -0,0 +1,242 @@
+"""
+Admission control and load shedding for AirSathi POC.
+
+Every request to a route listed in ``ROUTE_PRIORITIES`` has to be admitted
+before it reaches the FastAPI app. Each route has its own concurrency limit
+and short wait queue; on top of that the controller tracks the total load
+(in-flight + queued) and sheds lower priority classes first as it climbs,
+answering 429/503 with a ``Retry-After`` header instead of letting requests
+pile up behind a slow provider.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+from enum import Enum
+from typing import Dict, List, Optional
+
+from config import Config, ROUTE_PRIORITIES
+
+logger = logging.getLogger(__name__)
+
+
+class PriorityClass(str, Enum):
+    """Admission priority classes, highest first."""
+    CRITICAL = "critical"
+    STANDARD = "standard"
+    BULK = "bulk"
+
+
+# Lower rank is admitted first from the wait queue
+PRIORITY_RANK = {
+    PriorityClass.CRITICAL: 0,
+    PriorityClass.STANDARD: 1,
+    PriorityClass.BULK: 2,
+}
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is not admitted."""
+
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+
+    __slots__ = ("rank", "seq", "route", "future")
+
+    def __init__(self, rank: int, seq: int, route: str, future: asyncio.Future):
+        self.rank = rank
+        self.seq = seq
+        self.route = route
+        self.future = future
+
+
+class AdmissionController:
+
+    def __init__(
+        self,
+        route_priorities: Dict[str, str] = None,
+        max_in_flight: int = None,
+        route_concurrency: int = None,
+        max_queue_depth: int = None,
+        queue_timeout: float = None,
+        retry_after: int = None,
+        shed_thresholds: Dict[str, float] = None,
+    ):
+        route_priorities = ROUTE_PRIORITIES if route_priorities is None else route_priorities
+        self.route_priorities = {
+            route: PriorityClass(priority) for route, priority in route_priorities.items()
+        }
+        # Explicit zeros are meaningful (e.g. no queueing), so only None means "use Config"
+        self.max_in_flight = (
+            Config.ADMISSION_MAX_IN_FLIGHT if max_in_flight is None else max_in_flight
+        )
+        self.route_concurrency = (
+            Config.ADMISSION_ROUTE_CONCURRENCY if route_concurrency is None else route_concurrency
+        )
+        self.max_queue_depth = (
+            Config.ADMISSION_MAX_QUEUE_DEPTH if max_queue_depth is None else max_queue_depth
+        )
+        self.queue_timeout = (
+            Config.ADMISSION_QUEUE_TIMEOUT_SECONDS if queue_timeout is None else queue_timeout
+        )
+        self.retry_after = (
+            Config.ADMISSION_RETRY_AFTER_SECONDS if retry_after is None else retry_after
+        )
+        if shed_thresholds is None:
+            shed_thresholds = {
+                PriorityClass.CRITICAL: Config.ADMISSION_SHED_CRITICAL_AT,
+                PriorityClass.STANDARD: Config.ADMISSION_SHED_STANDARD_AT,
+                PriorityClass.BULK: Config.ADMISSION_SHED_BULK_AT,
+            }
+        self.shed_thresholds = {
+            PriorityClass(priority): fraction for priority, fraction in shed_thresholds.items()
+        }
+
+        self._in_flight: Dict[str, int] = {}
+        self._total_in_flight = 0
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self.rejected_count = 0
+
+    def priority_for(self, route: str) -> Optional[PriorityClass]:
+        return self.route_priorities.get(route)
+
+    @property
+    def capacity(self) -> int:
+        """Total load (in-flight + queued) the controller will carry."""
+        return self.max_in_flight + self.max_queue_depth
+
+    @property
+    def load(self) -> int:
+        return self._total_in_flight + len(self._waiters)
+
+    async def acquire(self, route: str) -> None:
+        """Wait until ``route`` may run, or raise ``AdmissionRejected``."""
+        priority = self.priority_for(route)
+        if priority is None:
+            return
+
+        if self.load >= self.capacity * self.shed_thresholds[priority]:
+            self._reject(503, f"Shedding {priority.value} traffic under load", route)
+
+        if self._has_capacity(route):
+            self._admit(route)
+            return
+
+        if self._queued_for(route) >= self.max_queue_depth:
+            self._reject(429, "Too many requests queued for this route", route)
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = _Waiter(PRIORITY_RANK[priority], next(self._seq), route, future)
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            # The slot may have been granted in the same loop turn as the timeout
+            if future.done() and not future.cancelled():
+                return
+            self._reject(503, "Timed out waiting for capacity", route)
+        except asyncio.CancelledError:
+            # Client went away; give the slot back if it had been granted
+            if future.done() and not future.cancelled():
+                self.release(route)
+            self._discard(waiter)
+            raise
+
+    def release(self, route: str) -> None:
+        if self.priority_for(route) is None:
+            return
+        self._in_flight[route] -= 1
+        self._total_in_flight -= 1
+        self._wake_waiters()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self._total_in_flight,
+            "queued": len(self._waiters),
+            "capacity": self.capacity,
+            "rejected": self.rejected_count,
+            "routes": {route: count for route, count in self._in_flight.items() if count},
+        }
+
+    def _has_capacity(self, route: str) -> bool:
+        return (
+            self._total_in_flight < self.max_in_flight
+            and self._in_flight.get(route, 0) < self.route_concurrency
+        )
+
+    def _admit(self, route: str) -> None:
+        self._in_flight[route] = self._in_flight.get(route, 0) + 1
+        self._total_in_flight += 1
+
+    def _queued_for(self, route: str) -> int:
+        return sum(1 for waiter in self._waiters if waiter.route == route)
+
+    def _discard(self, waiter: _Waiter) -> None:
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+
+    def _wake_waiters(self) -> None:
+        # Highest priority first, FIFO within a class
+        for waiter in sorted(self._waiters, key=lambda w: (w.rank, w.seq)):
+            if self._total_in_flight >= self.max_in_flight:
+                break
+            if waiter.future.done():
+                self._discard(waiter)
+                continue
+            if self._has_capacity(waiter.route):
+                self._discard(waiter)
+                self._admit(waiter.route)
+                waiter.future.set_result(None)
+
+    def _reject(self, status_code: int, reason: str, route: str) -> None:
+        self.rejected_count += 1
+        logger.warning(f"Admission rejected ({status_code}) for {route}: {reason}")
+        raise AdmissionRejected(status_code, reason, self.retry_after)
+
+
+class AdmissionMiddleware:
+    """ASGI middleware that runs every HTTP request through an ``AdmissionController``."""
+
+    def __init__(self, app, controller: AdmissionController = None):
+        self.app = app
+        self.controller = controller or AdmissionController()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = scope["path"]
+        try:
+            await self.controller.acquire(route)
+        except AdmissionRejected as e:
+            await self._send_rejection(send, e)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route)
+
+    @staticmethod
+    async def _send_rejection(send, rejection: AdmissionRejected) -> None:
+        body = json.dumps({"status": "rejected", "reason": rejection.reason}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": rejection.status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(rejection.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -32,9 +32,35 @@ class Config:
     # Test Passenger
     PASSENGER_PHONE = os.getenv("PASSENGER_PHONE", "+919876543210")
     PASSENGER_NAME = os.getenv("PASSENGER_NAME", "Rajesh Kumar")
+    
+    # Admission Control
+    ADMISSION_CONTROL_ENABLED = os.getenv("ADMISSION_CONTROL_ENABLED", "True").lower() == "true"
+    ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "64"))
+    ADMISSION_ROUTE_CONCURRENCY = int(os.getenv("ADMISSION_ROUTE_CONCURRENCY", "16"))
+    ADMISSION_MAX_QUEUE_DEPTH = int(os.getenv("ADMISSION_MAX_QUEUE_DEPTH", "32"))
+    ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "2.0"))
+    ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "5"))
+    # Fraction of total capacity (in-flight + queued) at which each class is shed
+    ADMISSION_SHED_BULK_AT = float(os.getenv("ADMISSION_SHED_BULK_AT", "0.5"))
+    ADMISSION_SHED_STANDARD_AT = float(os.getenv("ADMISSION_SHED_STANDARD_AT", "0.8"))
+    ADMISSION_SHED_CRITICAL_AT = float(os.getenv("ADMISSION_SHED_CRITICAL_AT", "1.0"))
+    
+    # Traffic Capture (opt-in, see replay.py)
+    TRAFFIC_CAPTURE_ENABLED = os.getenv("TRAFFIC_CAPTURE_ENABLED", "False").lower() == "true"
+    TRAFFIC_CAPTURE_PATH = os.getenv("TRAFFIC_CAPTURE_PATH", "traffic_trace.jsonl")
+    # Shared secret so pseudonyms match across workers/restarts; random per process if unset
+    TRAFFIC_CAPTURE_SALT = os.getenv("TRAFFIC_CAPTURE_SALT")
+    
+    # Flight Info Push Updates
+    FLIGHT_INFO_SSE_HEARTBEAT_SECONDS = float(os.getenv("FLIGHT_INFO_SSE_HEARTBEAT_SECONDS", "15"))
+    
+    # Reference Data (compiled with reference_data.py)
+    AIRPORTS_INDEX_PATH = os.getenv("AIRPORTS_INDEX_PATH", "airports.idx")
+    AIRLINES_INDEX_PATH = os.getenv("AIRLINES_INDEX_PATH", "airlines.idx")
+    REFERENCE_DATA_CHECK_SECONDS = float(os.getenv("REFERENCE_DATA_CHECK_SECONDS", "30"))
 
 
-# Airline web check-in URLs
+# Airline web check-in URLs (fallback when no reference data index is compiled)
 AIRLINE_CHECKIN_URLS = {
     "6E": "https://www.goindigo.in/web-check-in.html",
     "AI": "https://www.airindia.com/in/en/manage/web-check-in.html",
@@ -42,11 +68,25 @@ AIRLINE_CHECKIN_URLS = {
     "UK": "https://www.airvistara.com/in/en/travel-information/web-check-in",
 }
 
-# Airport names
+# Airport names (fallback when no reference data index is compiled)
 AIRPORT_NAMES = {
     "DEL": "Indira Gandhi International Airport, Delhi",
     "BOM": "Chhatrapati Shivaji Maharaj International Airport, Mumbai",
     "BLR": "Kempegowda International Airport, Bangalore",
     "MAA": "Chennai International Airport",
     "HYD": "Rajiv Gandhi International Airport, Hyderabad",
+}
+
+# Admission priority class per route: inbound replies and gate/boarding
+# alerts are admitted first, bulk reminders are shed first
+ROUTE_PRIORITIES = {
+    "/webhook/whatsapp": "critical",
+    "/api/send-gate-change": "critical",
+    "/api/send-boarding-call": "critical",
+    "/api/send-delay": "standard",
+    "/api/send-booking-confirmation": "standard",
+    "/api/send-baggage-belt-update": "standard",
+    "/api/send-reminder": "bulk",
+    "/api/send-pre-flight-checklist": "bulk",
+    "/api/send-smart-arrival-assistance": "bulk",
 }
\ No newline at end of file
@@ -1,28 +1,59 @@
 
 
-from fastapi import FastAPI, Query, Request
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
 from datetime import datetime
+from contextlib import asynccontextmanager
 import logging
+from anyio import to_thread
 
 from models import Flight
 from services import TwilioService, NotificationService
 from config import Config
+from admission import AdmissionController, AdmissionMiddleware
+from traffic_capture import TrafficCaptureMiddleware
+from read_model import FlightInfoReadModel
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if Config.ADMISSION_CONTROL_ENABLED:
+        # Admitted requests run sync handlers in anyio's threadpool; give them
+        # their own threads on top of the default so they never queue there,
+        # outside the admission queue's timeout and priority order.
+        limiter = to_thread.current_default_thread_limiter()
+        limiter.total_tokens += Config.ADMISSION_MAX_IN_FLIGHT
+    yield
+
+
 # Initialize FastAPI
 app = FastAPI(
     title="AirSathi POC",
     description="WhatsApp Travel Notifications",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Initialize services
 twilio_service = TwilioService()
 notification_service = NotificationService(twilio_service)
 
+# Backpressure for webhook and notification routes
+admission_controller = AdmissionController()
+if Config.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionMiddleware, controller=admission_controller)
+
+# Added last so it sits outermost and also records shed requests
+if Config.TRAFFIC_CAPTURE_ENABLED:
+    app.add_middleware(TrafficCaptureMiddleware)
+
+
 # Mock flight data
 mock_flight = Flight(
     pnr="ABC123",
@@ -37,6 +68,10 @@ mock_flight = Flight(
     terminal="3"
 )
 
+# Serialized flight info per PNR; republish whenever a Flight changes
+flight_info = FlightInfoReadModel()
+flight_info.publish(mock_flight)
+
 
 @app.get("/")
 def health_check():
@@ -56,8 +91,10 @@ async def whatsapp_webhook(request: Request):
     body = form.get("Body", "") or ""
 
     # For this POC we assume a single mock flight and treat any inbound
-    # WhatsApp message as coming from our test passenger.
-    log = notification_service.handle_incoming_message(
+    # WhatsApp message as coming from our test passenger. The reply is a
+    # blocking Twilio call, so keep it off the event loop.
+    log = await run_in_threadpool(
+        notification_service.handle_incoming_message,
         mock_flight,
         from_number.replace("whatsapp:", ""),  # normalise in case the prefix is present
         body,
@@ -85,6 +122,7 @@ def send_booking():
 def send_gate(new_gate: str = Query("45C")):
     old_gate = mock_flight.gate or "N/A"
     mock_flight.gate = new_gate
+    flight_info.publish(mock_flight)
     
     log = notification_service.send_gate_change(
         mock_flight, Config.PASSENGER_PHONE, old_gate, new_gate
@@ -177,16 +215,35 @@ def send_baggage_belt_update(belt_number: str = Query("5")):
 
 
 @app.get("/api/flight-info")
-def get_flight():
+async def get_flight(
+    pnr: str = Query(mock_flight.pnr),
+    if_none_match: Optional[str] = Header(None),
+):
     """Get current flight info."""
-    return {
-        "pnr": mock_flight.pnr,
-        "flight": mock_flight.flight_number,
-        "route": f"{mock_flight.departure_airport} → {mock_flight.arrival_airport}",
-        "departure": mock_flight.scheduled_departure.isoformat(),
-        "gate": mock_flight.gate,
-        "terminal": mock_flight.terminal
-    }
+    entry = flight_info.get(pnr)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"No flight found for PNR {pnr}")
+
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if entry.matches(if_none_match):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+@app.get("/api/flight-info/stream")
+async def stream_flight(
+    pnr: str = Query(mock_flight.pnr),
+    last_event_id: Optional[str] = Header(None),
+):
+    """Push flight info changes as Server-Sent Events."""
+    if flight_info.get(pnr) is None:
+        raise HTTPException(status_code=404, detail=f"No flight found for PNR {pnr}")
+
+    return StreamingResponse(
+        flight_info.stream(pnr, last_event_id, Config.FLIGHT_INFO_SSE_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+"""
+Cached flight-info read model for AirSathi POC.
+
+Keeps the serialized ``/api/flight-info`` response per PNR together with a
+content ETag, so polls are answered from memory (or with 304) and the body is
+only rebuilt when the underlying ``Flight`` is published again. Subscribers
+(Server-Sent Events streams) are pushed every new version.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+from typing import Dict, List, Optional, Set
+
+from models import Flight
+
+
+def build_flight_info(flight: Flight) -> dict:
+    return {
+        "pnr": flight.pnr,
+        "flight": flight.flight_number,
+        "route": f"{flight.departure_airport} → {flight.arrival_airport}",
+        "departure": flight.scheduled_departure.isoformat(),
+        "gate": flight.gate,
+        "terminal": flight.terminal
+    }
+
+
+class FlightInfoEntry:
+    """One immutable serialized version of a flight's info."""
+
+    __slots__ = ("pnr", "version", "event_id", "etag", "body")
+
+    def __init__(self, pnr: str, version: int, body: bytes):
+        self.pnr = pnr
+        self.version = version
+        self.body = body
+        # Content-derived so it stays valid across restarts and workers
+        self.event_id = hashlib.sha256(body).hexdigest()[:16]
+        self.etag = f'"{self.event_id}"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or any(tag.removeprefix("W/") == self.etag for tag in tags)
+
+
+class _Subscriber:
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+    def offer(self, entry: FlightInfoEntry) -> None:
+        # Slow clients only ever need the latest version
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(entry)
+
+
+class FlightInfoReadModel:
+
+    def __init__(self):
+        self._entries: Dict[str, FlightInfoEntry] = {}
+        self._subscribers: Dict[str, Set[_Subscriber]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, flight: Flight) -> FlightInfoEntry:
+        """Record the current state of ``flight`` and notify subscribers if it changed."""
+        body = json.dumps(
+            build_flight_info(flight), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+        with self._lock:
+            current = self._entries.get(flight.pnr)
+            if current is not None and current.body == body:
+                return current
+            entry = FlightInfoEntry(flight.pnr, current.version + 1 if current else 1, body)
+            self._entries[flight.pnr] = entry
+            subscribers: List[_Subscriber] = list(self._subscribers.get(flight.pnr, ()))
+
+        # Endpoints may publish from the threadpool; hand off to each stream's loop
+        for subscriber in subscribers:
+            subscriber.loop.call_soon_threadsafe(subscriber.offer, entry)
+        return entry
+
+    def get(self, pnr: str) -> Optional[FlightInfoEntry]:
+        return self._entries.get(pnr)
+
+    def subscribe(self, pnr: str) -> _Subscriber:
+        subscriber = _Subscriber(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(pnr, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, pnr: str, subscriber: _Subscriber) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(pnr)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[pnr]
+
+    async def stream(self, pnr: str, last_event_id: Optional[str] = None, heartbeat: float = 15.0):
+        """Yield Server-Sent Events for ``pnr``: the current version, then every change."""
+        subscriber = self.subscribe(pnr)
+        try:
+            entry = self.get(pnr)
+            if entry is not None and entry.event_id != last_event_id:
+                yield self._format_event(entry)
+                last_event_id = entry.event_id
+            while True:
+                try:
+                    entry = await asyncio.wait_for(subscriber.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                # A publish between subscribe() and get() is queued as well
+                if entry.event_id == last_event_id:
+                    continue
+                yield self._format_event(entry)
+                last_event_id = entry.event_id
+        finally:
+            self.unsubscribe(pnr, subscriber)
+
+    @staticmethod
+    def _format_event(entry: FlightInfoEntry) -> str:
+        return (
+            f"id: {entry.event_id}\n"
+            f"event: flight-info\n"
+            f"data: {entry.body.decode('utf-8')}\n\n"
+        )
@@ -0,0 +1,276 @@
+"""
+Airport and airline reference data for AirSathi POC.
+
+A source CSV is compiled into a compact binary index that every worker
+process memory-maps read-only, so the data lives once in the OS page cache,
+opening it costs only a header read, and lookups by IATA/ICAO code are a
+single hash probe. Recompiling replaces the index file atomically and
+running workers pick up the new file on their next lookup.
+
+Compile with:
+
+    python reference_data.py airports airports.csv
+    python reference_data.py airlines airlines.csv
+
+Index layout (little-endian):
+
+    header   magic, version, field count, record count, slot count, fields length
+    fields   JSON list of column names
+    slots    slot count x (u32 packed code, u32 record index), open addressing
+    offsets  (record count + 1) x u32 offsets into the record blob
+    records  UTF-8 field values joined by the unit separator
+"""
+
+import csv
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from config import Config, AIRLINE_CHECKIN_URLS, AIRPORT_NAMES
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ASRD"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIII")
+SLOT = struct.Struct("<II")
+OFFSET = struct.Struct("<I")
+RECORD_SPAN = struct.Struct("<II")
+FIELD_SEPARATOR = "\x1f"
+
+# Columns whose values are lookup keys, in every source CSV
+KEY_FIELDS = ("iata", "icao")
+
+
+class ReferenceDataError(Exception):
+    """Raised for malformed source data or index files."""
+
+
+def pack_code(code: str) -> Optional[int]:
+    """Pack a 2-4 character IATA/ICAO code into a non-zero u32, or None if it isn't one."""
+    if not code or len(code) > 4:
+        return None
+    try:
+        raw = code.strip().upper().encode("ascii")
+    except UnicodeEncodeError:
+        return None
+    if len(raw) < 2 or not raw.isalnum():
+        return None
+    return int.from_bytes(raw.ljust(4, b"\0"), "little")
+
+
+def _slot_for(key: int, bits: int) -> int:
+    # Fibonacci hashing: deterministic across processes, unlike hash()
+    return ((key * 0x9E3779B1) & 0xFFFFFFFF) >> (32 - bits)
+
+
+def compile_index(csv_path: str, index_path: str, key_fields: Sequence[str] = KEY_FIELDS) -> int:
+    """Compile ``csv_path`` into a binary index at ``index_path``; returns the record count."""
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        fields = [name.strip().lower() for name in next(reader, [])]
+        missing = [name for name in key_fields if name not in fields]
+        if missing:
+            raise ReferenceDataError(f"{csv_path} is missing key column(s): {', '.join(missing)}")
+        rows = [
+            [value.strip() for value in row[:len(fields)]] + [""] * (len(fields) - len(row))
+            for row in reader if row
+        ]
+    key_columns = [fields.index(name) for name in key_fields]
+
+    keys: Dict[int, int] = {}
+    records: List[bytes] = []
+    skipped = 0
+    for row in rows:
+        if any(FIELD_SEPARATOR in value for value in row):
+            raise ReferenceDataError(f"{csv_path} contains a reserved separator character")
+        record_keys = [pack_code(row[column]) for column in key_columns]
+        record_keys = [key for key in record_keys if key is not None and key not in keys]
+        if not record_keys:
+            skipped += 1
+            continue
+        for key in record_keys:
+            keys[key] = len(records)
+        records.append(FIELD_SEPARATOR.join(row).encode("utf-8"))
+
+    bits = max(1, (2 * len(keys) - 1).bit_length())
+    slot_count = 1 << bits
+    slots = [(0, 0)] * slot_count
+    for key, record in keys.items():
+        slot = _slot_for(key, bits)
+        while slots[slot][0]:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = (key, record)
+
+    fields_blob = json.dumps(fields).encode("utf-8")
+    parts = [
+        HEADER.pack(MAGIC, FORMAT_VERSION, len(fields), len(records), slot_count, len(fields_blob)),
+        fields_blob,
+    ]
+    parts.extend(SLOT.pack(key, record) for key, record in slots)
+    offset = 0
+    for record in records:
+        parts.append(OFFSET.pack(offset))
+        offset += len(record)
+    parts.append(OFFSET.pack(offset))
+    parts.extend(records)
+
+    # Write next to the target and rename so readers never see a partial file
+    directory = os.path.dirname(os.path.abspath(index_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.writelines(parts)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600; workers may run as another user
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    if skipped:
+        logger.warning(f"Skipped {skipped} row(s) without a new valid code in {csv_path}")
+    logger.info(f"Compiled {len(records)} records from {csv_path} into {index_path}")
+    return len(records)
+
+
+class ReferenceIndex:
+    """Read-only view over one memory-mapped index file."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            stat = os.fstat(f.fileno())
+        self.identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        if len(self._map) < HEADER.size:
+            raise ReferenceDataError(f"{path} is not a reference data index")
+        magic, version, field_count, record_count, slot_count, fields_len = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ReferenceDataError(f"{path} is not a version {FORMAT_VERSION} reference data index")
+
+        try:
+            self.fields = json.loads(self._map[HEADER.size:HEADER.size + fields_len])
+        except ValueError:
+            self.fields = None
+        if not isinstance(self.fields, list) or len(self.fields) != field_count:
+            raise ReferenceDataError(f"{path} has a corrupt field list")
+        self.record_count = record_count
+        self._bits = slot_count.bit_length() - 1
+        self._mask = slot_count - 1
+        self._slots_at = HEADER.size + fields_len
+        self._offsets_at = self._slots_at + slot_count * SLOT.size
+        self._records_at = self._offsets_at + (record_count + 1) * OFFSET.size
+
+        # Reject truncated files here so lookups never read past the end
+        if slot_count & (slot_count - 1) or len(self._map) < self._records_at:
+            raise ReferenceDataError(f"{path} is truncated or corrupt")
+        (records_len,) = OFFSET.unpack_from(self._map, self._offsets_at + record_count * OFFSET.size)
+        if len(self._map) < self._records_at + records_len:
+            raise ReferenceDataError(f"{path} is truncated or corrupt")
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def get(self, code: str) -> Optional[Dict[str, str]]:
+        key = pack_code(code)
+        if key is None:
+            return None
+        slot = _slot_for(key, self._bits)
+        while True:
+            slot_key, record = SLOT.unpack_from(self._map, self._slots_at + slot * SLOT.size)
+            if slot_key == key:
+                return self._record(record)
+            if not slot_key:
+                return None
+            slot = (slot + 1) & self._mask
+
+    def _record(self, record: int) -> Dict[str, str]:
+        start, end = RECORD_SPAN.unpack_from(self._map, self._offsets_at + record * OFFSET.size)
+        raw = self._map[self._records_at + start:self._records_at + end]
+        return dict(zip(self.fields, raw.decode("utf-8").split(FIELD_SEPARATOR)))
+
+
+class ReferenceTable:
+    """Hot-swappable handle on an index path.
+
+    The file is opened lazily and re-checked at most every
+    ``check_interval`` seconds; when it has been replaced the new index is
+    mapped and swapped in with a single assignment, so in-flight lookups
+    finish on the old mapping.
+    """
+
+    def __init__(self, path: str, check_interval: float = None):
+        self.path = path
+        self.check_interval = (
+            Config.REFERENCE_DATA_CHECK_SECONDS if check_interval is None else check_interval
+        )
+        self._index: Optional[ReferenceIndex] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, code: str) -> Optional[Dict[str, str]]:
+        if time.monotonic() >= self._next_check:
+            self.reload()
+        index = self._index
+        return index.get(code) if index is not None else None
+
+    def reload(self) -> None:
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                self._index = None
+                return
+            except OSError as e:
+                # e.g. a permission problem on the directory: keep what we have
+                logger.error(f"Failed to check reference data at {self.path}: {e}")
+                return
+            current = self._index
+            if current is not None and current.identity == (stat.st_ino, stat.st_mtime_ns, stat.st_size):
+                return
+            try:
+                self._index = ReferenceIndex(self.path)
+            except (OSError, ValueError, ReferenceDataError) as e:
+                # Keep serving the previous index rather than nothing
+                logger.error(f"Failed to load reference data from {self.path}: {e}")
+                return
+            logger.info(f"Loaded {len(self._index)} reference records from {self.path}")
+
+
+airports = ReferenceTable(Config.AIRPORTS_INDEX_PATH)
+airlines = ReferenceTable(Config.AIRLINES_INDEX_PATH)
+
+
+def airport_name(code: str) -> str:
+    """Full airport name for an IATA/ICAO code, falling back to the code itself."""
+    airport = airports.get(code)
+    if airport and airport.get("name"):
+        return airport["name"]
+    return AIRPORT_NAMES.get(code, code)
+
+
+def checkin_url(airline_code: str) -> str:
+    """Web check-in link for an airline IATA/ICAO code, or an empty string."""
+    airline = airlines.get(airline_code)
+    if airline and airline.get("checkin_url"):
+        return airline["checkin_url"]
+    return AIRLINE_CHECKIN_URLS.get(airline_code, "")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    targets = {"airports": Config.AIRPORTS_INDEX_PATH, "airlines": Config.AIRLINES_INDEX_PATH}
+    if len(sys.argv) != 3 or sys.argv[1] not in targets:
+        sys.exit("Usage: python reference_data.py {airports|airlines} SOURCE.csv")
+    compile_index(sys.argv[2], targets[sys.argv[1]])
@@ -0,0 +1,242 @@
+"""
+Time-compressed replay of captured traffic for AirSathi POC.
+
+Feeds a trace written by ``traffic_capture.py`` back into the FastAPI app
+in-process, with Twilio swapped for a local fake provider, and reports
+throughput and latency. Usage:
+
+    python replay.py traffic_trace.jsonl --speed 10
+    python replay.py traffic_trace.jsonl --speed max --provider-latency-ms 300
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import time
+from collections import Counter
+from typing import List, Optional
+from urllib.parse import urlencode
+
+# The app builds a real Twilio client at import time; make sure it never
+# needs credentials and never records its own replayed traffic.
+os.environ.setdefault("TWILIO_ACCOUNT_SID", "ACreplay")
+os.environ.setdefault("TWILIO_AUTH_TOKEN", "replay")
+os.environ.setdefault("TWILIO_WHATSAPP_NUMBER", "+10000000000")
+os.environ["TRAFFIC_CAPTURE_ENABLED"] = "False"
+
+logger = logging.getLogger(__name__)
+
+
+class FakeMessage:
+
+    def __init__(self, sid: str):
+        self.sid = sid
+
+
+class FakeMessages:
+
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self._ids = itertools.count(1)
+        self.sent = 0
+
+    def create(self, **params) -> FakeMessage:
+        # Called from the app's threadpool, just like the real client
+        time.sleep(self.latency)
+        self.sent += 1
+        return FakeMessage(f"SMFAKE{next(self._ids):026d}")
+
+
+class FakeTwilioClient:
+    """Stands in for ``twilio.rest.Client`` with a fixed per-message latency."""
+
+    def __init__(self, latency_ms: float = 0):
+        self.messages = FakeMessages(latency_ms)
+
+
+def load_trace(path: str) -> List[dict]:
+    """Load a trace, skipping lines that are torn or malformed (e.g. a worker killed mid-write)."""
+    entries = []
+    skipped = 0
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                skipped += 1
+                continue
+            if not isinstance(entry, dict) or not all(k in entry for k in ("ts", "method", "path")):
+                skipped += 1
+                continue
+            entries.append(entry)
+    if skipped:
+        logger.warning(f"Skipped {skipped} malformed line(s) in {path}")
+    entries.sort(key=lambda e: e["ts"])
+    return entries
+
+
+async def send_request(app, entry: dict) -> int:
+    """Drive one traced request through the ASGI app and return its status."""
+    headers = []
+    body = b""
+    if entry.get("form"):
+        body = urlencode(entry["form"]).encode()
+        headers.append((b"content-type", b"application/x-www-form-urlencoded"))
+    if entry.get("if_none_match"):
+        headers.append((b"if-none-match", entry["if_none_match"].encode("latin-1")))
+    headers.append((b"content-length", str(len(body)).encode()))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": entry["method"],
+        "scheme": "http",
+        "path": entry["path"],
+        "raw_path": entry["path"].encode(),
+        "query_string": entry.get("query", "").encode(),
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 0),
+        "server": ("replay", 80),
+    }
+    status = None
+    request_sent = False
+    response_started = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Hang up once the response has started so streams (SSE) end too
+        await response_started.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_started.set()
+
+    await app(scope, receive, send)
+    return status
+
+
+async def replay_with_lifespan(app, entries: List[dict], speed: Optional[float], concurrency: int) -> dict:
+    """Run the app's startup/shutdown hooks around ``replay``, as a server would."""
+    async with app.router.lifespan_context(app):
+        return await replay(app, entries, speed, concurrency)
+
+
+async def replay(app, entries: List[dict], speed: Optional[float], concurrency: int) -> dict:
+    """Replay ``entries`` at ``speed``x their recorded pace (``None`` = as fast as possible)."""
+    latencies = []
+    statuses = Counter()
+    routes = Counter()
+    limiter = asyncio.Semaphore(concurrency) if speed is None else None
+
+    async def run(entry: dict, due: float):
+        # Measured from when the request was due, so time spent waiting for
+        # a busy loop counts as latency
+        try:
+            status = await send_request(app, entry)
+        except Exception:
+            status = 500
+        latencies.append((time.perf_counter() - due) * 1000)
+        statuses[status] += 1
+        routes[entry["path"]] += 1
+
+    async def run_limited(entry: dict):
+        async with limiter:
+            await run(entry, time.perf_counter())
+
+    first_ts = entries[0]["ts"] if entries else 0
+    began = time.perf_counter()
+    tasks = []
+    for entry in entries:
+        if speed is None:
+            tasks.append(asyncio.create_task(run_limited(entry)))
+            continue
+        due = began + (entry["ts"] - first_ts) / speed
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(run(entry, due)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - began
+
+    return {
+        "requests": len(latencies),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": _percentiles(latencies),
+        "statuses": dict(statuses),
+        "routes": dict(routes),
+    }
+
+
+def _percentiles(values: List[float]) -> dict:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return {
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p99": pick(0.99),
+        "max": ordered[-1],
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"Requests:    {report['requests']}")
+    print(f"Elapsed:     {report['elapsed_s']:.2f} s")
+    print(f"Throughput:  {report['throughput_rps']:.1f} req/s")
+    for name, value in report["latency_ms"].items():
+        print(f"Latency {name}: {value:.1f} ms")
+    print("Statuses:    " + ", ".join(f"{code}={n}" for code, n in sorted(report["statuses"].items(), key=str)))
+    print("Routes:")
+    for route, n in sorted(report["routes"].items(), key=lambda item: -item[1]):
+        print(f"  {route}: {n}")
+
+
+def parse_speed(value: str) -> Optional[float]:
+    if value.lower() == "max":
+        return None
+    speed = float(value.lower().rstrip("x"))
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive or 'max'")
+    return speed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a captured AirSathi traffic trace")
+    parser.add_argument("trace", help="Trace file written by traffic capture")
+    parser.add_argument("--speed", type=parse_speed, default=1.0,
+                        help="Replay speed multiplier (1, 10, ...) or 'max' (default: 1)")
+    parser.add_argument("--provider-latency-ms", type=float, default=200.0,
+                        help="Simulated WhatsApp provider latency per message (default: 200)")
+    parser.add_argument("--concurrency", type=int, default=64,
+                        help="Max in-flight requests when replaying at max speed (default: 64)")
+    args = parser.parse_args()
+
+    import main as app_module
+
+    app_module.twilio_service.client = FakeTwilioClient(args.provider_latency_ms)
+    entries = load_trace(args.trace)
+    report = asyncio.run(replay_with_lifespan(app_module.app, entries, args.speed, args.concurrency))
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,8 @@ from typing import Optional
 import logging
 
 from models import Flight, NotificationType, NotificationLog
-from config import Config, AIRLINE_CHECKIN_URLS, AIRPORT_NAMES
+from config import Config
+from reference_data import airport_name, checkin_url
 
 logger = logging.getLogger(__name__)
 
@@ -79,14 +80,12 @@ class NotificationService:
                 "to live airline / airport APIs for real-time status and delays."
             )
         elif "check in" in text or "check-in" in text or "web checkin" in text:
-            from config import AIRLINE_CHECKIN_URLS  # local import to avoid cycles at module load
-
-            checkin_url = AIRLINE_CHECKIN_URLS.get(flight.airline_code, "")
-            if checkin_url:
+            url = checkin_url(flight.airline_code)
+            if url:
                 reply = (
                     f"*AirSathi – Web Check‑in Link*\n\n"
                     f"For flight {flight.flight_number} (PNR {flight.pnr}), you can use the "
-                    f"following link for web check‑in:\n{checkin_url}"
+                    f"following link for web check‑in:\n{url}"
                 )
             else:
                 reply = (
@@ -150,9 +149,9 @@ class NotificationService:
         return log
     
     def send_booking_confirmation(self, flight: Flight, phone: str) -> NotificationLog:
-        checkin_url = AIRLINE_CHECKIN_URLS.get(flight.airline_code, "")
-        dep_airport = AIRPORT_NAMES.get(flight.departure_airport, flight.departure_airport)
-        arr_airport = AIRPORT_NAMES.get(flight.arrival_airport, flight.arrival_airport)
+        airline_checkin_url = checkin_url(flight.airline_code)
+        dep_airport = airport_name(flight.departure_airport)
+        arr_airport = airport_name(flight.arrival_airport)
         
         message = f"""*AirSathi – Booking Confirmation*
 
@@ -169,7 +168,7 @@ Your flight booking has been confirmed. Please find the details below:
 *Gate:* {flight.gate or 'TBA'}
 *Terminal:* {flight.terminal}
 
-*Web check-in:* {checkin_url}
+*Web check-in:* {airline_checkin_url}
 
 You can type “help” or “menu” for seeing more options in this chat to prepare for your journey. I will inform if there are any further updates to your flight."""
 
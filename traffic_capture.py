@@ -0,0 +1,223 @@
+"""
+Opt-in traffic capture for AirSathi POC.
+
+Appends one compact JSON line per HTTP request (method, path, query, form
+payload, conditional ``If-None-Match`` header, status and timing) to ``Config.TRAFFIC_CAPTURE_PATH`` so production
+bursts can be replayed later with ``replay.py``. Phone numbers and passenger
+names are replaced with salted pseudonyms before anything touches disk, and
+the file is written from a background thread so requests never wait on it.
+Each batch goes out as a single ``O_APPEND`` write, so several worker
+processes can share one trace file without tearing lines.
+"""
+
+import atexit
+import hashlib
+import hmac
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Twilio form fields that always hold a phone number
+PHONE_FIELDS = {"From", "To", "WaId"}
+# Twilio form fields that hold the passenger's name
+NAME_FIELDS = {"ProfileName"}
+
+# 10-15 digits in free text, allowing spaces, dashes, dots and brackets between them
+PHONE_PATTERN = re.compile(r"(?<![0-9A-Za-z])\+?\(?\d(?:[\s.\-()]*\d){9,14}(?![0-9A-Za-z])")
+PHONE_FIELD_PATTERN = re.compile(r"\+?\d{7,15}")
+
+FORM_CONTENT_TYPE = b"application/x-www-form-urlencoded"
+# Long-lived push streams aren't replayable request/response traffic
+STREAM_CONTENT_TYPE = b"text/event-stream"
+
+
+class PhoneRedactor:
+    """Replaces phone numbers and names with salted, stable pseudonyms.
+
+    Set ``TRAFFIC_CAPTURE_SALT`` to link a passenger's messages across worker
+    processes and restarts; without it each process uses a random salt.
+    """
+
+    def __init__(self, salt: bytes = None):
+        if salt is None and Config.TRAFFIC_CAPTURE_SALT:
+            salt = Config.TRAFFIC_CAPTURE_SALT.encode("utf-8")
+        # Secret salt so pseudonyms cannot be brute-forced back to numbers
+        self.salt = salt or os.urandom(16)
+
+    def _digest(self, value: str) -> str:
+        return hmac.new(self.salt, value.encode(), hashlib.sha256).hexdigest()[:10]
+
+    def pseudonym(self, number: str) -> str:
+        return f"+redacted-{self._digest(re.sub(r'[^0-9]', '', number))}"
+
+    def redact(self, value: str, phone_field: bool = False) -> str:
+        pattern = PHONE_FIELD_PATTERN if phone_field else PHONE_PATTERN
+        return pattern.sub(lambda m: self.pseudonym(m.group(0)), value)
+
+    def redact_fields(self, fields: Dict[str, str]) -> Dict[str, str]:
+        return {
+            key: f"redacted-{self._digest(value)}" if key in NAME_FIELDS else self.redact(value, key in PHONE_FIELDS)
+            for key, value in fields.items()
+        }
+
+
+class TrafficRecorder:
+    """Append-only JSON Lines trace writer.
+
+    ``record`` only enqueues; a daemon thread redacts, serializes and writes
+    each batch with one ``os.write`` on an ``O_APPEND`` descriptor.
+    """
+
+    def __init__(self, path: str = None, redactor: PhoneRedactor = None):
+        self.path = path or Config.TRAFFIC_CAPTURE_PATH
+        self.redactor = redactor or PhoneRedactor()
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="traffic-capture", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(
+        self,
+        started_at: float,
+        method: str,
+        path: str,
+        query: str,
+        form: Optional[Dict[str, str]],
+        status: Optional[int],
+        duration_ms: float,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        # Nothing to queue for if the trace file could not be opened
+        if self._thread.is_alive():
+            self._queue.put((started_at, method, path, query, form, status, duration_ms, if_none_match))
+
+    def close(self) -> None:
+        """Write everything queued so far and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        stopping = False
+        try:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        except OSError as e:
+            logger.error(f"Failed to open traffic trace {self.path}: {e}")
+            return
+        try:
+            while not stopping:
+                batch = [self._queue.get()]
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                lines = []
+                for args in batch:
+                    if args is None:
+                        stopping = True
+                        continue
+                    lines.append(self._format(*args))
+                if not lines:
+                    continue
+                data = "".join(lines).encode("utf-8")
+                try:
+                    # One write per batch: O_APPEND keeps it contiguous even
+                    # when other workers append to the same file
+                    while data:
+                        data = data[os.write(fd, data):]
+                except OSError as e:
+                    logger.error(f"Failed to write traffic trace: {e}")
+        finally:
+            os.close(fd)
+
+    def _format(
+        self,
+        started_at: float,
+        method: str,
+        path: str,
+        query: str,
+        form: Optional[Dict[str, str]],
+        status: Optional[int],
+        duration_ms: float,
+        if_none_match: Optional[str] = None,
+    ) -> str:
+        entry = {
+            "ts": round(started_at, 3),
+            "method": method,
+            "path": path,
+        }
+        if query:
+            entry["query"] = urlencode(self.redactor.redact_fields(dict(parse_qsl(query))))
+        if form:
+            entry["form"] = self.redactor.redact_fields(form)
+        if if_none_match:
+            # Kept so replayed polls get the same 304s production did
+            entry["if_none_match"] = if_none_match
+        entry["status"] = status
+        entry["ms"] = round(duration_ms, 2)
+        return json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+class TrafficCaptureMiddleware:
+    """ASGI middleware that hands every HTTP request to a ``TrafficRecorder``."""
+
+    def __init__(self, app, recorder: TrafficRecorder = None):
+        self.app = app
+        self.recorder = recorder or TrafficRecorder()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        is_form = headers.get(b"content-type", b"").startswith(FORM_CONTENT_TYPE)
+        if_none_match = headers.get(b"if-none-match", b"").decode("latin-1") or None
+        body_chunks = []
+        status = None
+        streaming = False
+
+        async def capture_receive():
+            message = await receive()
+            if is_form and message["type"] == "http.request":
+                body_chunks.append(message.get("body", b""))
+            return message
+
+        async def capture_send(message):
+            nonlocal status, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+                streaming = content_type.startswith(STREAM_CONTENT_TYPE)
+            await send(message)
+
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, capture_receive, capture_send)
+        finally:
+            if not streaming:
+                form = None
+                if body_chunks:
+                    form = dict(parse_qsl(b"".join(body_chunks).decode("utf-8", "replace"), keep_blank_values=True))
+                self.recorder.record(
+                    started_at,
+                    scope["method"],
+                    scope["path"],
+                    scope["query_string"].decode("latin-1"),
+                    form,
+                    status,
+                    (time.perf_counter() - start) * 1000,
+                    if_none_match,
+                )